@@ -1,7 +1,8 @@
 """LangGraph definition for the Music Store Assistant.
 
 This module defines the StateGraph with:
-- Supervisor node: Routes user intent to appropriate worker
+- Supervisor node: Routes user intent to appropriate worker (keyword fast path,
+  LLM for everything else)
 - Music_Expert node: Handles read-only catalog queries
 - Support_Rep node: Handles sensitive account operations (with HITL for refunds)
 
@@ -20,11 +21,13 @@ Supported providers are auto-detected from model name:
 from __future__ import annotations
 
 import os
-from typing import Literal, Optional
+import re
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Literal, Optional
 
-from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.language_models import BaseChatModel
-from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 from langgraph.checkpoint.base import BaseCheckpointSaver
@@ -41,6 +44,9 @@ from src.tools.support import (
     HITL_TOOLS,
 )
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
 
 # --- Prompts ---
 
@@ -144,11 +150,148 @@ class RouteDecision(BaseModel):
     )
 
 
+# --- Keyword Fast Path ---
+
+# Unambiguous keywords from SUPERVISOR_PROMPT's routing rules. A latest message
+# that hits exactly one route is routed without calling the supervisor LLM;
+# no hits or hits for both routes fall through to the LLM.
+KEYWORD_ROUTES: tuple[tuple[re.Pattern[str], Literal["music", "support"]], ...] = (
+    (
+        re.compile(
+            r"\b(?:artist|album|song|track|genre|band|music|listen)s?\b", re.IGNORECASE
+        ),
+        "music",
+    ),
+    # Not "order" or "bill": they collide with names like New Order and Bill Evans
+    (re.compile(r"\b(?:refund|invoice|account|email)s?\b", re.IGNORECASE), "support"),
+)
+
+# Purchase and payment wording points at support even next to a catalog noun
+# ("the album I bought"), but these words are too ambiguous to route on, so
+# any hit leaves the decision to the LLM.
+KEYWORD_VETO = re.compile(
+    r"\b(?:buy|bought|purchase[ds]?|orders?|pay(?:ment)?s?|paid|charged|receipts?"
+    r"|money back)\b",
+    re.IGNORECASE,
+)
+
+
+def keyword_route(text: str) -> Literal["music", "support"] | None:
+    """Route a message by keyword, or return None if the LLM should decide.
+
+    Args:
+        text: The latest user message.
+
+    Returns:
+        "music" or "support" when exactly one route's keywords match and no
+        KEYWORD_VETO word appears, else None.
+    """
+    if KEYWORD_VETO.search(text):
+        return None
+    matches = {route for pattern, route in KEYWORD_ROUTES if pattern.search(text)}
+    if len(matches) == 1:
+        return matches.pop()
+    return None
+
+
 # --- Model Factory ---
 
 DEFAULT_MODEL = "gpt-4o-mini"
 
 
+# langchain_openai is heavy to import, so it is loaded on first use
+_CHAT_OPENAI: type[ChatOpenAI] | None = None
+
+
+def _get_chat_openai() -> type[ChatOpenAI]:
+    """Return the ChatOpenAI class, importing langchain_openai on first call."""
+    global _CHAT_OPENAI
+    if _CHAT_OPENAI is None:
+        from langchain_openai import ChatOpenAI
+
+        _CHAT_OPENAI = ChatOpenAI
+    return _CHAT_OPENAI
+
+
+# Optional provider chat classes, imported on first use. None marks a provider
+# whose package isn't installed, so the failed import is not retried per call.
+_OPTIONAL_CHAT_CLASSES: dict[str, Callable[..., BaseChatModel] | None] = {}
+
+
+def _get_optional_chat_class(provider: str) -> Callable[..., BaseChatModel] | None:
+    """Return the chat class for "gemini" or "anthropic", or None if missing."""
+    try:
+        return _OPTIONAL_CHAT_CLASSES[provider]
+    except KeyError:
+        pass
+
+    chat_class: Callable[..., BaseChatModel] | None
+    try:
+        if provider == "gemini":
+            from langchain_google_genai import ChatGoogleGenerativeAI as chat_class
+        else:
+            from langchain_anthropic import ChatAnthropic as chat_class
+    except ImportError:
+        chat_class = None
+    _OPTIONAL_CHAT_CLASSES[provider] = chat_class
+    return chat_class
+
+
+# Clients are reused per (provider, model, temperature, kwargs) so every graph
+# built in this process shares one HTTP connection pool per configuration
+_MODEL_CACHE: dict[tuple, BaseChatModel] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+# Factories for specific model names, tried before provider detection. Each is
+# called with temperature= plus any extra kwargs and returns a chat model.
+_MODEL_FACTORIES: dict[str, Callable[..., BaseChatModel]] = {}
+
+
+def register_model(name: str, factory: Callable[..., BaseChatModel]) -> None:
+    """Register a factory that builds the chat model for a specific model name.
+
+    Args:
+        name: Model name as it appears in the role env vars (case-insensitive)
+        factory: Callable taking temperature= and extra kwargs, returning the
+            chat model client
+    """
+    model_name = name.strip().lower()
+    with _MODEL_CACHE_LOCK:
+        _MODEL_FACTORIES[model_name] = factory
+        # Drop clients built for this name before the factory was registered
+        for key in [key for key in _MODEL_CACHE if key[1] == model_name]:
+            del _MODEL_CACHE[key]
+
+
+register_model(
+    DEFAULT_MODEL, lambda **kwargs: _get_chat_openai()(model=DEFAULT_MODEL, **kwargs)
+)
+
+
+# Provider by the model name's first dash-separated token
+_HEADS = {"gemini": "gemini", "claude": "anthropic", "deepseek": "deepseek"}
+
+
+@lru_cache(maxsize=32)
+def _resolve_provider(model_name: str) -> tuple[str, str]:
+    """Normalize a model name and detect its provider from the name prefix.
+
+    Args:
+        model_name: Raw model name, e.g. from an environment variable.
+
+    Returns:
+        (provider, normalized_name) where provider is one of "openai",
+        "gemini", "anthropic" or "deepseek". Unknown prefixes map to "openai".
+    """
+    normalized = model_name.strip().lower()
+    head = normalized.partition("-")[0]
+    return _HEADS.get(head, "openai"), normalized
+
+
+# The default model never changes after import, so resolve it once
+_DEFAULT_RESOLVED = _resolve_provider(DEFAULT_MODEL)
+
+
 def get_model_for_role(
     role: str,
     env_var: str,
@@ -156,7 +299,7 @@ def get_model_for_role(
     default: str | None = None,
     **kwargs,
 ) -> BaseChatModel:
-    """Create a chat model based on environment configuration.
+    """Create (or reuse) a chat model based on environment configuration.
 
     Auto-detects provider from model name prefix:
     - gpt-* → OpenAI
@@ -172,46 +315,67 @@ def get_model_for_role(
         **kwargs: Additional arguments passed to the model constructor
 
     Returns:
-        Configured BaseChatModel instance
+        Configured BaseChatModel instance, shared with any earlier call that
+        resolved to the same provider, model, temperature and kwargs
     """
-    fallback = default or DEFAULT_MODEL
-    model_name = os.getenv(env_var, fallback).strip().lower()
-    if not model_name:
-        model_name = fallback
-
-    # Auto-detect provider from model name
-    if model_name.startswith("gemini"):
-        try:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-
+    configured = os.environ.get(env_var)
+    if configured is None and default is None:
+        # Common case for roles that share the default model
+        provider, model_name = _DEFAULT_RESOLVED
+    else:
+        fallback = default or DEFAULT_MODEL
+        provider, model_name = _resolve_provider(configured or fallback)
+        if not model_name:
+            provider, model_name = _resolve_provider(fallback)
+
+    try:
+        key = (provider, model_name, temperature, tuple(sorted(kwargs.items())))
+        hash(key)
+    except TypeError:
+        # Unhashable kwargs: build a fresh, uncached client
+        return _build_model(role, provider, model_name, temperature, **kwargs)
+
+    model = _MODEL_CACHE.get(key)
+    if model is None:
+        with _MODEL_CACHE_LOCK:
+            model = _MODEL_CACHE.get(key)
+            if model is None:
+                model = _build_model(role, provider, model_name, temperature, **kwargs)
+                _MODEL_CACHE[key] = model
+    return model
+
+
+def _build_model(
+    role: str, provider: str, model_name: str, temperature: float, **kwargs
+) -> BaseChatModel:
+    """Construct a chat model client for a resolved provider and model name."""
+    factory = _MODEL_FACTORIES.get(model_name)
+    if factory is not None:
+        print(f"🤖 {role}: Using registered model ({model_name})")
+        return factory(temperature=temperature, **kwargs)
+
+    if provider == "gemini":
+        chat_class = _get_optional_chat_class(provider)
+        if chat_class is not None:
             print(f"🤖 {role}: Using Gemini ({model_name})")
-            return ChatGoogleGenerativeAI(
-                model=model_name, temperature=temperature, **kwargs
-            )
-        except ImportError:
-            print(
-                f"⚠️ langchain-google-genai not installed, falling back to {DEFAULT_MODEL}"
-            )
-            model_name = DEFAULT_MODEL
-
-    elif model_name.startswith("claude"):
-        try:
-            from langchain_anthropic import ChatAnthropic
+            return chat_class(model=model_name, temperature=temperature, **kwargs)
+        print(
+            f"⚠️ langchain-google-genai not installed, falling back to {DEFAULT_MODEL}"
+        )
+        model_name = DEFAULT_MODEL
 
+    elif provider == "anthropic":
+        chat_class = _get_optional_chat_class(provider)
+        if chat_class is not None:
             print(f"🤖 {role}: Using Anthropic ({model_name})")
-            return ChatAnthropic(
-                model_name=model_name, temperature=temperature, **kwargs
-            )
-        except ImportError:
-            print(
-                f"⚠️ langchain-anthropic not installed, falling back to {DEFAULT_MODEL}"
-            )
-            model_name = DEFAULT_MODEL
+            return chat_class(model_name=model_name, temperature=temperature, **kwargs)
+        print(f"⚠️ langchain-anthropic not installed, falling back to {DEFAULT_MODEL}")
+        model_name = DEFAULT_MODEL
 
-    elif model_name.startswith("deepseek"):
+    elif provider == "deepseek":
         try:
             print(f"🤖 {role}: Using DeepSeek ({model_name})")
-            return ChatOpenAI(
+            return _get_chat_openai()(
                 model=model_name,
                 temperature=temperature,
                 base_url="https://api.deepseek.com",
@@ -224,7 +388,7 @@ def get_model_for_role(
 
     # Default: OpenAI (gpt-* models)
     print(f"🤖 {role}: Using OpenAI ({model_name})")
-    return ChatOpenAI(model=model_name, temperature=temperature, **kwargs)
+    return _get_chat_openai()(model=model_name, temperature=temperature, **kwargs)
 
 
 # --- Node Functions ---
@@ -235,6 +399,23 @@ def create_supervisor_node(model: BaseChatModel):
 
     def supervisor(state: State) -> dict:
         """Route the user's request to the appropriate worker."""
+        # Obvious requests are routed by keyword without an LLM call
+        last_message = state["messages"][-1]
+        if isinstance(last_message, HumanMessage) and isinstance(
+            last_message.content, str
+        ):
+            route = keyword_route(last_message.content)
+            if route is not None:
+                return {
+                    "messages": [
+                        AIMessage(
+                            content=f"[Routing to {route}: keyword match]",
+                            name="supervisor",
+                        )
+                    ],
+                    "route": route,
+                }
+
         messages = [SystemMessage(content=SUPERVISOR_PROMPT)] + state["messages"]
 
         # Use structured output for routing decision (strict=True enforces enum values)
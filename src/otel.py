@@ -115,18 +115,19 @@ class AttributeFilterProcessor(SpanProcessor):
         keys_to_remove = []
         keys_to_update: dict[str, AttributeValue] = {}
 
-        # First pass: find the highest message index to determine if we need to limit
-        max_msg_index = -1
+        # First pass (keys only): parse each input message index once so the
+        # classification pass below can reuse it
+        msg_indices: dict[str, int] = {}
         for key in attrs.keys():
             if key.startswith("llm.input_messages."):
                 # Extract index from "llm.input_messages.N.message.xxx"
                 try:
                     parts = key.split(".")
                     if len(parts) >= 3:
-                        idx = int(parts[2])
-                        max_msg_index = max(max_msg_index, idx)
+                        msg_indices[key] = int(parts[2])
                 except (ValueError, IndexError):
                     pass
+        max_msg_index = max(msg_indices.values(), default=-1)
 
         # Calculate which message indices to keep:
         # Always keep index 0 (system prompt) + last MAX_MESSAGES
@@ -141,35 +142,33 @@ class AttributeFilterProcessor(SpanProcessor):
                 # Keep all messages if under limit
                 keep_indices.update(range(0, max_msg_index + 1))
 
-        for key, value in attrs.items():
+        # Second pass: iterate keys and only read the value for attributes we
+        # might truncate - dropped attributes never touch their value
+        for key in attrs.keys():
             # Check if we should DROP this attribute entirely
             if key in DROP_ATTRIBUTES:
                 keys_to_remove.append(key)
                 continue
 
             # Check if prefix matches DROP list
-            if any(key.startswith(prefix) for prefix in DROP_PREFIXES):
+            if key.startswith(DROP_PREFIXES):
                 keys_to_remove.append(key)
                 continue
 
             # Check if this is a message we should drop due to limit
-            if key.startswith("llm.input_messages."):
-                try:
-                    parts = key.split(".")
-                    if len(parts) >= 3:
-                        idx = int(parts[2])
-                        if idx not in keep_indices:
-                            keys_to_remove.append(key)
-                            continue
-                except (ValueError, IndexError):
-                    pass
+            idx = msg_indices.get(key)
+            if idx is not None and idx not in keep_indices:
+                keys_to_remove.append(key)
+                continue
 
             # Check if this is a KEEP attribute (no modification)
             if key in KEEP_ATTRIBUTES:
                 continue
 
+            value = attrs[key]
+
             # Check if prefix matches KEEP list - truncate string values
-            if any(key.startswith(prefix) for prefix in KEEP_PREFIXES):
+            if key.startswith(KEEP_PREFIXES):
                 if isinstance(value, str):
                     # System prompts get extra truncation (less useful in traces)
                     if "message.content" in key and ".0." in key:
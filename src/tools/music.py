@@ -4,8 +4,128 @@ These are READ-ONLY tools for querying the music catalog.
 Used by the Music_Expert node.
 """
 
+import threading
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING
+
 from langchain_core.tools import tool
-from src.utils import get_db
+
+if TYPE_CHECKING:
+    from langchain_community.utilities.sql_database import SQLDatabase
+    from sqlalchemy import TextClause
+
+# Bound on first use so tool calls skip the get_db() cache lookup, and so
+# importing this module doesn't pull in SQLAlchemy / langchain_community
+_DB: "SQLDatabase | None" = None
+
+
+def _db() -> "SQLDatabase":
+    """Return the shared Chinook database, resolving it on first use."""
+    global _DB
+    if _DB is None:
+        from src.utils import get_db
+
+        _DB = get_db()
+    return _DB
+
+
+# --- Queries ---
+# User input is never interpolated into the SQL: LIKE searches take it as
+# the :pattern bind parameter, name searches go through _search().
+
+
+@lru_cache(maxsize=None)
+def _query(sql: str) -> "TextClause":
+    """Compile a query into a SQLAlchemy text() statement once and reuse it."""
+    from sqlalchemy import text
+
+    return text(sql)
+
+
+# Unfiltered catalog queries backing the in-memory search indexes. Both are
+# keyed on their "Name" column (artist name / track name).
+_ALBUMS_INDEX_SQL = """
+    SELECT Album.Title, Artist.Name
+    FROM Album
+    JOIN Artist ON Album.ArtistId = Artist.ArtistId;
+"""
+
+_TRACKS_BY_ARTIST_SQL = """
+    SELECT Track.Name as SongName, Artist.Name as ArtistName
+    FROM Album
+    LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    LEFT JOIN Track ON Track.AlbumId = Album.AlbumId
+    WHERE Artist.Name LIKE :pattern;
+"""
+
+_SONGS_INDEX_SQL = """
+    SELECT Track.Name, Album.Title as AlbumTitle, Track.Milliseconds/1000 as DurationSeconds
+    FROM Track
+    JOIN Album ON Track.AlbumId = Album.AlbumId;
+"""
+
+_ARTISTS_BY_GENRE_SQL = """
+    SELECT Artist.Name as ArtistName, COUNT(*) as TrackCount
+    FROM Genre
+    JOIN Track ON Genre.GenreId = Track.GenreId
+    JOIN Album ON Track.AlbumId = Album.AlbumId
+    JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    WHERE Genre.Name LIKE :pattern
+    GROUP BY Artist.Name
+    ORDER BY TrackCount DESC
+    LIMIT 15;
+"""
+
+_GENRES_SQL = "SELECT Name FROM Genre ORDER BY Name;"
+
+
+# --- In-memory search indexes ---
+# The catalog is small and read-only, so substring searches on artist and
+# track names scan a cached list instead of running a LIKE query per call.
+
+# SQLDatabase's default max_string_length, so results match db.run() output
+_MAX_STRING_LENGTH = 300
+
+_INDEXES: dict[str, list[tuple[str, dict]]] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def _load_index(sql: str) -> list[tuple[str, dict]]:
+    """Run an unfiltered catalog query into (lowercased Name, row) pairs."""
+    from langchain_community.utilities.sql_database import truncate_word
+
+    # _execute reads every row before its connection goes back to the pool;
+    # run() would stringify them, and run(fetch="cursor") hands back a cursor
+    # whose connection has already been released.
+    rows = _db()._execute(_query(sql), fetch="all")
+    index = []
+    for row in rows:
+        record = {
+            column: truncate_word(value, length=_MAX_STRING_LENGTH)
+            for column, value in row.items()
+        }
+        index.append((row["Name"].lower(), record))
+    return index
+
+
+def _index(sql: str) -> list[tuple[str, dict]]:
+    """Return the cached index for a catalog query, loading it on first use."""
+    index = _INDEXES.get(sql)
+    if index is None:
+        with _INDEX_LOCK:
+            index = _INDEXES.get(sql)
+            if index is None:
+                index = _INDEXES[sql] = _load_index(sql)
+    return index
+
+
+def _search(sql: str, term: str, limit: int | None = None) -> str:
+    """Case-insensitive substring search over an index, formatted like db.run()."""
+    needle = term.lower()
+    matches = (record for name, record in _index(sql) if needle in name)
+    rows = list(islice(matches, limit))
+    return str(rows) if rows else ""
 
 
 @tool
@@ -21,16 +141,7 @@ def get_albums_by_artist(artist: str) -> str:
     Returns:
         A formatted string of album titles and artist names.
     """
-    db = get_db()
-    return db.run(
-        f"""
-        SELECT Album.Title, Artist.Name 
-        FROM Album 
-        JOIN Artist ON Album.ArtistId = Artist.ArtistId 
-        WHERE Artist.Name LIKE '%{artist}%';
-        """,
-        include_columns=True,
-    )
+    return _search(_ALBUMS_INDEX_SQL, artist)
 
 
 @tool
@@ -46,16 +157,11 @@ def get_tracks_by_artist(artist: str) -> str:
     Returns:
         A formatted string of track names and artist names.
     """
-    db = get_db()
+    db = _db()
     return db.run(
-        f"""
-        SELECT Track.Name as SongName, Artist.Name as ArtistName 
-        FROM Album 
-        LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId 
-        LEFT JOIN Track ON Track.AlbumId = Album.AlbumId 
-        WHERE Artist.Name LIKE '%{artist}%';
-        """,
+        _query(_TRACKS_BY_ARTIST_SQL),
         include_columns=True,
+        parameters={"pattern": f"%{artist}%"},
     )
 
 
@@ -72,17 +178,7 @@ def check_for_songs(song_title: str) -> str:
     Returns:
         Track information including name, album, and duration.
     """
-    db = get_db()
-    return db.run(
-        f"""
-        SELECT Track.Name, Album.Title as AlbumTitle, Track.Milliseconds/1000 as DurationSeconds
-        FROM Track
-        JOIN Album ON Track.AlbumId = Album.AlbumId
-        WHERE Track.Name LIKE '%{song_title}%'
-        LIMIT 20;
-        """,
-        include_columns=True,
-    )
+    return _search(_SONGS_INDEX_SQL, song_title, limit=20)
 
 
 @tool
@@ -98,23 +194,20 @@ def get_artists_by_genre(genre: str) -> str:
     Returns:
         A list of top artists in that genre with their track counts.
     """
-    db = get_db()
+    db = _db()
     return db.run(
-        f"""
-        SELECT Artist.Name as ArtistName, COUNT(*) as TrackCount
-        FROM Genre
-        JOIN Track ON Genre.GenreId = Track.GenreId
-        JOIN Album ON Track.AlbumId = Album.AlbumId
-        JOIN Artist ON Album.ArtistId = Artist.ArtistId
-        WHERE Genre.Name LIKE '%{genre}%'
-        GROUP BY Artist.Name
-        ORDER BY TrackCount DESC
-        LIMIT 15;
-        """,
+        _query(_ARTISTS_BY_GENRE_SQL),
         include_columns=True,
+        parameters={"pattern": f"%{genre}%"},
     )
 
 
+@lru_cache(maxsize=1)
+def _genre_listing() -> str:
+    """Query the genre list once; the catalog's genres don't change at runtime."""
+    return _db().run(_query(_GENRES_SQL), include_columns=True)
+
+
 @tool
 def list_genres() -> str:
     """List all available music genres in our catalog.
@@ -125,20 +218,17 @@ def list_genres() -> str:
     Returns:
         A list of all genres available in the catalog.
     """
-    db = get_db()
-    return db.run(
-        """
-        SELECT Name FROM Genre ORDER BY Name;
-        """,
-        include_columns=True,
-    )
+    return _genre_listing()
 
 
-# Export all music tools as a list for easy binding
-MUSIC_TOOLS = [
+# Export all music tools as an immutable tuple for easy binding
+MUSIC_TOOLS = (
     get_albums_by_artist,
     get_tracks_by_artist,
     check_for_songs,
     get_artists_by_genre,
     list_genres,
-]
+)
+
+# Tool lookup by the name the model uses in its tool calls
+MUSIC_TOOLS_BY_NAME = {tool.name: tool for tool in MUSIC_TOOLS}
@@ -8,10 +8,26 @@ injected at runtime and NOT accessible to the LLM. This prevents prompt
 injection attacks from accessing other customers' data.
 """
 
+from typing import TYPE_CHECKING
+
 from langchain.tools import tool, ToolRuntime
 from src.state import CustomerContext
 from src.utils import get_db
 
+if TYPE_CHECKING:
+    from langchain_community.utilities.sql_database import SQLDatabase
+
+# Bound on first use so tool calls skip the get_db() cache lookup
+_DB: "SQLDatabase | None" = None
+
+
+def _db() -> "SQLDatabase":
+    """Return the shared Chinook database, resolving it on first use."""
+    global _DB
+    if _DB is None:
+        _DB = get_db()
+    return _DB
+
 
 @tool
 def get_customer_info(runtime: ToolRuntime[CustomerContext]) -> str:
@@ -24,7 +40,7 @@ def get_customer_info(runtime: ToolRuntime[CustomerContext]) -> str:
         Customer profile information as a formatted string.
     """
     customer_id = runtime.context.customer_id
-    db = get_db()
+    db = _db()
     return db.run(
         f"""
         SELECT CustomerId, FirstName, LastName, Email, Phone, Address, City, Country
@@ -52,7 +68,7 @@ def get_invoice(
         Invoice information as a formatted string.
     """
     customer_id = runtime.context.customer_id
-    db = get_db()
+    db = _db()
 
     if invoice_id is not None:
         # Look up a specific invoice - MUST belong to this customer
@@ -98,7 +114,7 @@ def process_refund(invoice_id: int, *, runtime: ToolRuntime[CustomerContext]) ->
         Confirmation message for the refund initiation.
     """
     customer_id = runtime.context.customer_id
-    db = get_db()
+    db = _db()
 
     # Verify the invoice exists AND belongs to this customer
     invoice_info = db.run(
@@ -1,12 +1,31 @@
 """Pytest configuration and fixtures."""
 
 import pytest
+import itertools
 import os
+import sys
+import uuid
+from collections import defaultdict
 from pathlib import Path
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from functools import lru_cache
 
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
 
-@dataclass
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_ENV_PATH = _PROJECT_ROOT / ".env"
+_DB_PATH = _PROJECT_ROOT / "Chinook.db"
+_LLM_CACHE_PATH = _PROJECT_ROOT / "tests" / ".llm_cache.sqlite"
+
+_SUMMARY_RULE = "=" * 60
+_SUMMARY_SEP = "-" * 60
+_SUMMARY_HEADER = ("", _SUMMARY_RULE, "🔥 LLM TOKEN USAGE SUMMARY", _SUMMARY_RULE)
+
+
+@dataclass(slots=True)
 class TokenUsageTracker:
     """Track token usage across all tests in a session."""
 
@@ -17,7 +36,11 @@ class TokenUsageTracker:
     llm_calls: int = 0
 
     # Track per-test breakdown
-    test_costs: dict = field(default_factory=dict)
+    test_costs: defaultdict = field(
+        default_factory=lambda: defaultdict(
+            lambda: {"tokens": 0, "cost": 0.0, "calls": 0}
+        )
+    )
     current_test: str = ""
 
     def add_usage(self, prompt: int, completion: int, cost: float):
@@ -29,46 +52,36 @@ class TokenUsageTracker:
         self.llm_calls += 1
 
         # Track per-test
-        if self.current_test:
-            if self.current_test not in self.test_costs:
-                self.test_costs[self.current_test] = {
-                    "tokens": 0,
-                    "cost": 0.0,
-                    "calls": 0,
-                }
-            self.test_costs[self.current_test]["tokens"] += prompt + completion
-            self.test_costs[self.current_test]["cost"] += cost
-            self.test_costs[self.current_test]["calls"] += 1
+        test = self.current_test
+        if test:
+            entry = self.test_costs[test]
+            entry["tokens"] += prompt + completion
+            entry["cost"] += cost
+            entry["calls"] += 1
 
     def summary(self) -> str:
         """Generate a summary report."""
+        # Top 5 most expensive tests, by cost descending
+        top_tests = []
+        if self.test_costs:
+            top_tests = sorted(
+                self.test_costs.items(), key=lambda x: x[1]["cost"], reverse=True
+            )[:5]
         lines = [
-            "",
-            "=" * 60,
-            "🔥 LLM TOKEN USAGE SUMMARY",
-            "=" * 60,
+            *_SUMMARY_HEADER,
             f"  Total LLM Calls:      {self.llm_calls:,}",
             f"  Prompt Tokens:        {self.prompt_tokens:,}",
             f"  Completion Tokens:    {self.completion_tokens:,}",
             f"  Total Tokens:         {self.total_tokens:,}",
             f"  Estimated Cost:       ${self.total_cost:.4f}",
-            "-" * 60,
+            _SUMMARY_SEP,
+            *(["  Top 5 Most Expensive Tests:"] if top_tests else []),
+            *(
+                f"    {name.split('::')[-1][:40]:<40} ${data['cost']:.4f} ({data['tokens']:,} tokens)"
+                for name, data in top_tests
+            ),
+            _SUMMARY_RULE,
         ]
-
-        if self.test_costs:
-            # Sort by cost descending
-            sorted_tests = sorted(
-                self.test_costs.items(), key=lambda x: x[1]["cost"], reverse=True
-            )[:5]  # Top 5 most expensive
-
-            lines.append("  Top 5 Most Expensive Tests:")
-            for test_name, data in sorted_tests:
-                short_name = test_name.split("::")[-1][:40]
-                lines.append(
-                    f"    {short_name:<40} ${data['cost']:.4f} ({data['tokens']:,} tokens)"
-                )
-
-        lines.append("=" * 60)
         return "\n".join(lines)
 
 
@@ -76,47 +89,75 @@ class TokenUsageTracker:
 _token_tracker = TokenUsageTracker()
 
 
-def get_langsmith_tags() -> list[str]:
-    """Build list of tags for LangSmith tracing.
+@lru_cache(maxsize=1)
+def get_langsmith_tags() -> tuple[str, ...]:
+    """Build tags for LangSmith tracing.
 
     Always includes 'test'. Also includes any tags from LANGCHAIN_TAGS env var
     (comma-separated), such as 'ci-cd' when running in GitHub Actions.
+
+    The env var doesn't change during a session, so the result is cached as an
+    immutable tuple. Call get_langsmith_tags.cache_clear() after changing
+    LANGCHAIN_TAGS.
     """
     tags = ["test"]
 
     # Add additional tags from environment (e.g., 'ci-cd' from GitHub Actions)
     extra_tags = os.getenv("LANGCHAIN_TAGS", "")
-    if extra_tags:
+    if "," in extra_tags:
         tags.extend(tag.strip() for tag in extra_tags.split(",") if tag.strip())
+    elif extra_tags := extra_tags.strip():
+        tags.append(extra_tags)
 
-    return tags
+    return tuple(tags)
 
 
-def pytest_configure(config):
-    """Register custom markers and set test mode for LangSmith tagging."""
-    config.addinivalue_line(
-        "markers", "integration: marks tests as integration tests (may call LLM/DB)"
+def pytest_addoption(parser):
+    """Add command-line options for the test suite."""
+    parser.addoption(
+        "--client-scope",
+        choices=("session", "module"),
+        default="session",
+        help="Scope of the API client fixture (default: session)",
+    )
+    parser.addoption(
+        "--llm-cache",
+        action="store_true",
+        default=False,
+        help=f"Reuse LLM responses for identical prompts via {_LLM_CACHE_PATH.name}",
     )
 
-    # Enable test mode for LangSmith tagging
-    # This causes the API's build_config to add 'test' tag to all traces
-    os.environ["LANGSMITH_TEST_MODE"] = "1"
 
+def pytest_configure(config):
+    """Load .env and set test mode for LangSmith tagging.
 
-@pytest.fixture(scope="session", autouse=True)
-def load_env():
-    """Load environment variables from .env file."""
+    Runs before collection, so env vars are in place before any test module
+    imports src.* code.
+    """
     from dotenv import load_dotenv
 
-    # Load from project root
-    env_path = Path(__file__).parent.parent / ".env"
-    load_dotenv(env_path)
+    # Load environment variables from the project root .env file
+    load_dotenv(_ENV_PATH)
 
-    # Ensure test mode stays set after loading .env
+    # Enable test mode for LangSmith tagging (set after .env so it can't be overridden)
+    # This causes the API's build_config to add 'test' tag to all traces
     os.environ["LANGSMITH_TEST_MODE"] = "1"
 
+    if config.getoption("--llm-cache"):
+        from langchain_community.cache import SQLiteCache
+        from langchain_core.globals import set_llm_cache
 
-@pytest.fixture
+        set_llm_cache(SQLiteCache(database_path=str(_LLM_CACHE_PATH)))
+
+
+def pytest_collection_modifyitems(config, items):
+    """Pin serial-marked tests to one xdist worker (needs --dist loadgroup)."""
+    for item in items:
+        if item.get_closest_marker("serial"):
+            item.add_marker(pytest.mark.xdist_group("serial"))
+
+
+@pytest.fixture(scope="session")
 def test_config():
     """Provide a config dict with appropriate tags for LangSmith filtering.
 
@@ -124,22 +165,26 @@ def test_config():
 
     Note: customer_id is NOT in configurable - use test_context fixture for that.
 
+    Shared by the whole session (LangChain copies the config on invoke), so
+    tests must not modify it.
+
     Usage in tests:
         result = graph.invoke({"messages": [...]}, test_config, context=test_context)
     """
     return {
         "configurable": {},
-        "tags": get_langsmith_tags(),
+        "tags": list(get_langsmith_tags()),
         "run_name": "music_store_assistant_test",
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_context():
     """Provide the runtime context dict for graph invocation.
 
     This is passed via the context= parameter to graph.invoke(),
-    NOT in configurable (which would be insecure).
+    NOT in configurable (which would be insecure). Shared by the whole
+    session, so tests must not modify it.
 
     Usage in tests:
         result = graph.invoke({"messages": [...]}, test_config, context=test_context)
@@ -147,7 +192,7 @@ def test_context():
     return {"customer_id": 16}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config_with_thread():
     """Factory fixture to create test config with a specific thread_id.
 
@@ -155,6 +200,9 @@ def test_config_with_thread():
 
     Note: Returns (config, context) tuple since they're passed separately.
 
+    The thread_id is used as a readable prefix; a random suffix keeps threads
+    unique when tests share a checkpointer or run in parallel under xdist.
+
     Usage in tests:
         config, context = test_config_with_thread("my-thread-id")
         result = graph.invoke({"messages": [...]}, config, context=context)
@@ -162,8 +210,8 @@ def test_config_with_thread():
 
     def _make_config(thread_id: str, customer_id: int = 16):
         config = {
-            "configurable": {"thread_id": thread_id},
-            "tags": get_langsmith_tags(),
+            "configurable": {"thread_id": f"{thread_id}-{uuid.uuid4().hex[:12]}"},
+            "tags": list(get_langsmith_tags()),
             "run_name": "music_store_assistant_test",
         }
         context = {"customer_id": customer_id}
@@ -172,13 +220,354 @@ def test_config_with_thread():
     return _make_config
 
 
+@lru_cache(maxsize=1)
+def _get_app():
+    """Import the FastAPI app once; graph and DB setup happen on first call."""
+    from src.api import app
+
+    return app
+
+
+def _client_scope(fixture_name, config) -> str:
+    """Scope for the client fixture, chosen with --client-scope."""
+    return config.getoption("--client-scope")
+
+
+@pytest.fixture(scope=_client_scope)
+def client():
+    """Provide a shared API test client (per session by default).
+
+    Building TestClient runs the app's startup once instead of per test.
+    Per-test API state is cleared by _reset_api_state. Pass
+    --client-scope=module to get a fresh client per test file when chasing
+    order-dependent failures.
+    """
+    from fastapi.testclient import TestClient
+
+    with TestClient(_get_app()) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def compiled_graph():
+    """Compile the checkpointer-less graph once and share it across tests.
+
+    The compiled graph holds no per-run state without a checkpointer, so
+    reuse is safe. Tests that need memory should still build their own
+    graph with a fresh MemorySaver.
+    """
+    from src.graph import create_graph
+
+    return create_graph()
+
+
+class EphemeralMemorySaver(MemorySaver):
+    """MemorySaver that keeps only the latest checkpoint per thread.
+
+    Tests resume from the newest checkpoint and never time-travel, so older
+    checkpoints (and their pending writes) are dropped on every put, along
+    with channel values they alone referenced. Memory stays flat across long
+    multi-turn conversations instead of holding a serialized copy of the
+    message list for every step.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (thread_id, checkpoint_ns, channel) -> latest stored blob version
+        self._blob_versions: dict[tuple, object] = {}
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = next_config["configurable"]["thread_id"]
+        checkpoint_ns = next_config["configurable"]["checkpoint_ns"]
+        checkpoint_id = next_config["configurable"]["checkpoint_id"]
+
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        stale = [cid for cid in checkpoints if cid != checkpoint_id]
+        for cid in stale:
+            del checkpoints[cid]
+            self.writes.pop((thread_id, checkpoint_ns, cid), None)
+
+        # The new checkpoint points at the new version of each updated
+        # channel, so the previous version's blob is no longer reachable
+        for channel, version in new_versions.items():
+            key = (thread_id, checkpoint_ns, channel)
+            previous = self._blob_versions.get(key)
+            if previous is not None and previous != version:
+                self.blobs.pop((*key, previous), None)
+            self._blob_versions[key] = version
+        return next_config
+
+
+@pytest.fixture(scope="session")
+def checkpointed_graph():
+    """Graph with a checkpointer, compiled once for the whole session.
+
+    Checkpoints are keyed by thread_id, so tests sharing this graph stay
+    isolated as long as they use test_config_with_thread's unique ids.
+    """
+    from src.graph import create_graph
+
+    return create_graph(checkpointer=EphemeralMemorySaver())
+
+
+@pytest.fixture(scope="module")
+def _checkpointer_pool():
+    """Reusable checkpointers for one test module."""
+    return [EphemeralMemorySaver() for _ in range(8)]
+
+
+@pytest.fixture
+def memory_saver(_checkpointer_pool):
+    """Empty single-slot checkpointer for a graph under test, from the pool."""
+    saver = _checkpointer_pool.pop() if _checkpointer_pool else EphemeralMemorySaver()
+    saver.storage.clear()
+    saver.writes.clear()
+    saver.blobs.clear()
+    saver._blob_versions.clear()
+    yield saver
+    _checkpointer_pool.append(saver)
+
+
+# Known routes for unambiguous demo/test queries, keyed by _normalize_query().
+# Context-dependent follow-ups ("yes", "tell me more") are deliberately left
+# out so they still go through the supervisor LLM with the full history.
+ROUTING_CACHE: dict[str, str] = {
+    # Music
+    "what ac/dc albums do you carry": "music",
+    "what ac/dc albums do you have": "music",
+    "what albums does ac/dc have": "music",
+    "what jazz artists do you have": "music",
+    "what genres of music do you carry": "music",
+    "do you have any songs with 'love' in the title": "music",
+    "do you have any led zeppelin": "music",
+    "actually, do you have any led zeppelin": "music",
+    "actually, what rock bands do you have": "music",
+    "i'm looking for some rock music": "music",
+    "do you have led zeppelin": "music",
+    "do you have any taylor swift albums": "music",
+    # Support
+    "hello": "support",
+    "can you tell me about my account": "support",
+    "what is my email address on file": "support",
+    "what are my recent invoices": "support",
+    "i want a refund": "support",
+    "i want a refund for invoice 143": "support",
+    "i want a refund for invoice 98": "support",
+    "i'd like a refund for invoice 98": "support",
+}
+
+
+def _normalize_query(text: str) -> str:
+    """Normalize a user message into a ROUTING_CACHE key."""
+    return " ".join(text.lower().split()).rstrip("?!.")
+
+
+@pytest.fixture(scope="session")
+def graph_with_cached_router():
+    """Checkpointed graph whose supervisor skips the LLM on known queries.
+
+    Wraps the real supervisor node: if the latest human message is in
+    ROUTING_CACHE, the cached route is returned directly; otherwise the
+    original LLM router runs. Use only in tests that exercise the workers,
+    not the routing decision itself.
+
+    Compiled once per session; tests are isolated by the unique thread_ids
+    from test_config_with_thread.
+    """
+    from langchain_core.messages import HumanMessage
+
+    import src.graph as graph_module
+
+    create_supervisor_node = graph_module.create_supervisor_node
+
+    def create_cached_supervisor_node(model):
+        supervisor = create_supervisor_node(model)
+
+        def cached_supervisor(state) -> dict:
+            last = state["messages"][-1]
+            route = None
+            if isinstance(last, HumanMessage) and isinstance(last.content, str):
+                route = ROUTING_CACHE.get(_normalize_query(last.content))
+            if route is None:
+                return supervisor(state)
+            return {
+                "messages": [
+                    AIMessage(
+                        content=f"[Routing to {route}: cached route]",
+                        name="supervisor",
+                    )
+                ],
+                "route": route,
+            }
+
+        return cached_supervisor
+
+    # The supervisor node is captured when the graph is built, so the patch
+    # only needs to cover create_graph()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            graph_module, "create_supervisor_node", create_cached_supervisor_node
+        )
+        return graph_module.create_graph(checkpointer=EphemeralMemorySaver())
+
+
+class FakeToolChatModel(GenericFakeChatModel):
+    """Offline chat model that accepts bind_tools, for structural graph tests."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Make create_graph build every role with FakeToolChatModel.
+
+    Skips real provider client construction for tests that only inspect the
+    graph's structure and never invoke a model.
+    """
+    monkeypatch.setattr(
+        "src.graph.get_model_for_role",
+        lambda *args, **kwargs: FakeToolChatModel(
+            messages=itertools.repeat(AIMessage(content="ok"))
+        ),
+    )
+
+
+def _canned_refund_turns():
+    """Yield the support rep's side of a refund: look up, refund, confirm.
+
+    Invoice 134 belongs to the default test customer (16).
+    """
+    call_ids = itertools.count()
+    while True:
+        for tool_name in ("get_invoice", "process_refund"):
+            yield AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": tool_name,
+                        "args": {"invoice_id": 134},
+                        "id": f"call_{next(call_ids)}",
+                    }
+                ],
+            )
+        yield AIMessage(content="Your refund for invoice 134 has been submitted.")
+
+
+@pytest.fixture
+def fake_support_llm(monkeypatch):
+    """Make create_graph build a support rep that always walks the refund path.
+
+    The support rep calls get_invoice, then process_refund (which hits the
+    HITL interrupt), then confirms. Other roles get a plain FakeToolChatModel.
+    Use for tests of the graph's HITL wiring, not of LLM judgement.
+    """
+
+    def model_for_role(role, *args, **kwargs):
+        if role == "Support Rep":
+            return FakeToolChatModel(messages=_canned_refund_turns())
+        return FakeToolChatModel(messages=itertools.repeat(AIMessage(content="ok")))
+
+    monkeypatch.setattr("src.graph.get_model_for_role", model_for_role)
+
+
+@pytest.fixture
+def fake_support_graph(fake_support_llm):
+    """Checkpointed graph whose support rep is the canned fake_support_llm."""
+    from src.graph import create_graph
+
+    return create_graph(checkpointer=EphemeralMemorySaver())
+
+
+# src.api's HITL tracking dicts, bound once the module has been imported
+_api_state: tuple[dict, ...] = ()
+
+
+@pytest.fixture(autouse=True)
+def _reset_api_state():
+    """Clear in-memory HITL tracking so API tests don't leak into each other."""
+    global _api_state
+    if not _api_state:
+        api = sys.modules.get("src.api")
+        if api is not None:
+            _api_state = (api.pending_approvals, api.rejected_responses)
+    for state in _api_state:
+        state.clear()
+    yield
+
+
+@lru_cache(maxsize=1)
+def _resolve_db_path() -> str | None:
+    """Return the Chinook database path, or None if it hasn't been set up."""
+    return str(_DB_PATH) if _DB_PATH.exists() else None
+
+
 @pytest.fixture(scope="session")
 def db_path():
     """Return the path to the Chinook database."""
-    path = Path(__file__).parent.parent / "Chinook.db"
-    if not path.exists():
+    path = _resolve_db_path()
+    if path is None:
         pytest.skip("Chinook.db not found - run setup first")
-    return str(path)
+    return path
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _prewarm_model_factory():
+    """Pay the model factory's and tools' one-time imports before the first test runs.
+
+    src.graph, the @tool-decorated support tools and langchain_openai are
+    otherwise imported by whichever test touches them first, which skews that
+    test's timing.
+    """
+    import src.graph as graph_module
+    import src.tools.support  # noqa: F401
+
+    graph_module._get_chat_openai()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _in_memory_chinook():
+    """Serve music and support tool queries from an in-memory copy of Chinook.
+
+    The database is copied once per session (per xdist worker) with SQLite's
+    backup API into a named shared-cache memory database, and the tools'
+    cached handles are pointed at it. Each thread gets its own connection to
+    the shared copy, so concurrent graph runs don't share one connection.
+    """
+    path = _resolve_db_path()
+    if path is None:
+        yield None
+        return
+
+    import sqlite3
+
+    from langchain_community.utilities.sql_database import SQLDatabase
+    from sqlalchemy import create_engine
+
+    uri = f"file:chinook-{os.getpid()}?mode=memory&cache=shared"
+
+    def connect():
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    # The shared database lives as long as at least one connection is open
+    keeper = connect()
+    disk = sqlite3.connect(path)
+    try:
+        disk.backup(keeper)
+    finally:
+        disk.close()
+
+    engine = create_engine("sqlite://", creator=connect)
+    db = SQLDatabase(engine)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("src.tools.music._DB", db)
+        mp.setattr("src.tools.support._DB", db)
+        yield db
+
+    engine.dispose()
+    keeper.close()
 
 
 # ============================================================================
@@ -192,14 +581,37 @@ def token_tracker():
     return _token_tracker
 
 
-@pytest.fixture(autouse=True)
-def track_current_test(request):
+def pytest_runtest_setup(item):
     """Track which test is currently running for per-test cost breakdown."""
-    _token_tracker.current_test = request.node.nodeid
-    yield
+    _token_tracker.current_test = item.nodeid
+
+
+def pytest_runtest_teardown(item, nextitem):
+    """Clear the current test once it has finished."""
     _token_tracker.current_test = ""
 
 
+@lru_cache(maxsize=1)
+def _get_openai_callback_factory():
+    """Import get_openai_callback once, on first use."""
+    from langchain_community.callbacks import get_openai_callback
+
+    return get_openai_callback
+
+
+@contextmanager
+def _tracked_openai_callback():
+    """Wrap get_openai_callback and record its usage on the session tracker."""
+    get_openai_callback = _get_openai_callback_factory()
+
+    with get_openai_callback() as cb:
+        yield cb
+    # Record usage after the context exits
+    _token_tracker.add_usage(
+        prompt=cb.prompt_tokens, completion=cb.completion_tokens, cost=cb.total_cost
+    )
+
+
 @pytest.fixture
 def openai_callback():
     """Provide an OpenAI callback that tracks token usage.
@@ -210,22 +622,11 @@ def openai_callback():
                 result = graph.invoke(...)
             # Tokens automatically tracked
     """
-    from langchain_community.callbacks import get_openai_callback
-    from contextlib import contextmanager
-
-    @contextmanager
-    def _tracked_callback():
-        with get_openai_callback() as cb:
-            yield cb
-        # Record usage after the context exits
-        _token_tracker.add_usage(
-            prompt=cb.prompt_tokens, completion=cb.completion_tokens, cost=cb.total_cost
-        )
-
-    return _tracked_callback
+    return _tracked_openai_callback
 
 
 def pytest_terminal_summary(terminalreporter, exitstatus, config):
     """Print token usage summary at end of test run."""
-    if _token_tracker.llm_calls > 0:
-        terminalreporter.write_line(_token_tracker.summary())
+    if not _token_tracker.llm_calls:
+        return
+    terminalreporter.write_line(_token_tracker.summary())
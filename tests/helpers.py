@@ -0,0 +1,14 @@
+"""Plain helper functions shared by test modules."""
+
+
+def find_tool_call(messages: list, tool_name: str) -> dict | None:
+    """Return a tool call named tool_name from messages, or None.
+
+    Scans from the tail, since the call of interest is usually among the
+    last few messages, and stops at the first match.
+    """
+    for msg in reversed(messages):
+        for tool_call in getattr(msg, "tool_calls", None) or ():
+            if tool_call["name"] == tool_name:
+                return tool_call
+    return None
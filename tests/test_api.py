@@ -4,42 +4,9 @@ import pytest
 from fastapi.testclient import TestClient
 
 
-@pytest.fixture
-def client():
-    """Create a test client for the API."""
-    from src.api import app
-
-    return TestClient(app)
-
-
 class TestChatEndpoint:
     """Tests for POST /chat endpoint."""
 
-    def test_chat_endpoint_exists(self, client: TestClient):
-        """The /chat endpoint should exist and accept POST."""
-        response = client.post("/chat", json={"message": "hello"})
-        assert response.status_code != 404
-
-    def test_chat_requires_message(self, client: TestClient):
-        """The /chat endpoint should require a message field."""
-        response = client.post("/chat", json={})
-        assert response.status_code == 422
-
-    @pytest.mark.integration
-    def test_chat_returns_response(self, client: TestClient):
-        """The /chat endpoint should return a response with content."""
-        response = client.post(
-            "/chat",
-            json={
-                "message": "What albums does AC/DC have?",
-                "thread_id": "test-music-123",
-            },
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "response" in data
-        assert "thread_id" in data
-
     @pytest.mark.integration
     def test_refund_triggers_hitl(self, client: TestClient):
         """Refund requests should trigger HITL and return requires_approval."""
@@ -0,0 +1,59 @@
+"""Basic request/response semantics of the /chat endpoint."""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+class TestChatEndpoint:
+    """Tests for POST /chat endpoint."""
+
+    @pytest.mark.integration
+    def test_chat_endpoint_exists(self, client: TestClient):
+        """The /chat endpoint should exist and accept POST."""
+        response = client.post("/chat", json={"message": "hello"})
+        assert response.status_code != 404
+
+    def test_chat_requires_message(self, client: TestClient):
+        """The /chat endpoint should require a message field."""
+        response = client.post("/chat", json={})
+        assert response.status_code == 422
+
+    @pytest.mark.integration
+    def test_chat_returns_response(self, client: TestClient):
+        """A music query through /chat should return a response with content."""
+        response = client.post(
+            "/chat",
+            json={
+                "message": "What albums does AC/DC have?",
+                "thread_id": f"test-music-{uuid.uuid4().hex[:12]}",
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["response"]
+        assert "thread_id" in data
+
+    @pytest.mark.integration
+    def test_chat_uses_provided_thread_id(self, client: TestClient):
+        """Chat should return a thread_id and reuse a provided one."""
+        # First message - no thread_id, so the API should mint one
+        r1 = client.post("/chat", json={"message": "Hello", "customer_id": 16})
+        assert r1.status_code == 200
+        data = r1.json()
+        assert "response" in data
+        assert data["thread_id"] is not None
+        thread_id = data["thread_id"]
+
+        # Second message with same thread
+        r2 = client.post(
+            "/chat",
+            json={
+                "message": "What's my account info?",
+                "thread_id": thread_id,
+                "customer_id": 1,
+            },
+        )
+
+        assert r2.json()["thread_id"] == thread_id
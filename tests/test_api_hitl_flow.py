@@ -7,86 +7,68 @@ These tests verify:
 4. Rejection followed by new refund request works (fresh thread)
 """
 
+import json
+
 import pytest
-from fastapi.testclient import TestClient
 
-from src.api import app, pending_approvals, rejected_responses
+from src.api import pending_approvals, rejected_responses
 
 
-@pytest.fixture
-def client():
-    """Create a test client and clear state between tests."""
-    pending_approvals.clear()
-    rejected_responses.clear()
-    return TestClient(app)
+_REFUND_JSON = json.dumps(
+    {"message": "I want a refund for invoice 143", "customer_id": 16}
+).encode()
+_JSON_HEADERS = {"content-type": "application/json"}
 
 
-class TestChatEndpoint:
-    """Test the /chat endpoint."""
+def _post_chat(client, body: bytes):
+    """POST an already-serialized JSON body to /chat."""
+    return client.post("/chat", content=body, headers=_JSON_HEADERS)
+
+
+def _get_to_hitl(client, confirmation: str = "yes") -> dict:
+    """Request a refund and confirm it, leaving the thread awaiting approval.
+
+    Args:
+        confirmation: The user's reply to the bot's confirmation question.
+
+    Returns:
+        The /chat response body for the confirmation turn.
+    """
+    thread_id = _post_chat(client, _REFUND_JSON).json()["thread_id"]
+    confirm = json.dumps(
+        {"message": confirmation, "thread_id": thread_id, "customer_id": 16}
+    ).encode()
+    return _post_chat(client, confirm).json()
 
-    def test_chat_returns_thread_id(self, client):
-        """Chat should return a thread_id."""
-        response = client.post("/chat", json={"message": "Hello", "customer_id": 16})
-        assert response.status_code == 200
-        data = response.json()
-        assert "thread_id" in data
-        assert "response" in data
-        assert data["thread_id"] is not None
-
-    def test_chat_uses_provided_thread_id(self, client):
-        """Chat should use provided thread_id for conversation continuity."""
-        # First message
-        r1 = client.post("/chat", json={"message": "Hello", "customer_id": 16})
-        thread_id = r1.json()["thread_id"]
-
-        # Second message with same thread
-        r2 = client.post(
-            "/chat",
-            json={
-                "message": "What's my account info?",
-                "thread_id": thread_id,
-                "customer_id": 1,
-            },
-        )
 
-        assert r2.json()["thread_id"] == thread_id
+@pytest.fixture
+def hitl_thread(client):
+    """Drive a fresh thread to the HITL approval gate and return its thread_id.
+
+    Function-scoped on purpose: approve/reject tests consume the pending
+    approval, and pending_approvals is cleared between tests anyway.
+    """
+    data = _get_to_hitl(client)
+    assert data["requires_approval"], "HITL should be triggered"
+    return data["thread_id"]
 
 
+@pytest.mark.integration
 class TestHITLFlow:
     """Test the Human-in-the-Loop approval flow."""
 
     def test_refund_request_triggers_hitl(self, client):
         """A confirmed refund request should trigger HITL."""
-        # Step 1: Ask for refund
-        r1 = client.post(
-            "/chat",
-            json={"message": "I want a refund for invoice 143", "customer_id": 16},
-        )
-        thread_id = r1.json()["thread_id"]
-
-        # Step 2: Confirm
-        r2 = client.post(
-            "/chat",
-            json={"message": "yes please", "thread_id": thread_id, "customer_id": 16},
-        )
+        data = _get_to_hitl(client, "yes please")
 
-        data = r2.json()
         assert data["requires_approval"], "Refund confirmation should require approval"
-        assert thread_id in pending_approvals, "Thread should be in pending_approvals"
-
-    def test_approve_endpoint_works(self, client):
-        """Approve endpoint should resume the graph."""
-        # Setup: Get to HITL state
-        r1 = client.post(
-            "/chat",
-            json={"message": "I want a refund for invoice 143", "customer_id": 16},
+        assert data["thread_id"] in pending_approvals, (
+            "Thread should be in pending_approvals"
         )
-        thread_id = r1.json()["thread_id"]
 
-        r2 = client.post(
-            "/chat", json={"message": "yes", "thread_id": thread_id, "customer_id": 16}
-        )
-        assert r2.json()["requires_approval"]
+    def test_approve_endpoint_works(self, client, hitl_thread):
+        """Approve endpoint should resume the graph."""
+        thread_id = hitl_thread
 
         # Approve
         r3 = client.post(f"/approve/{thread_id}?customer_id=16")
@@ -96,19 +78,9 @@ class TestHITLFlow:
         assert "response" in data
         assert thread_id not in pending_approvals, "Should be removed from pending"
 
-    def test_reject_endpoint_works(self, client):
+    def test_reject_endpoint_works(self, client, hitl_thread):
         """Reject endpoint should return canned message."""
-        # Setup: Get to HITL state
-        r1 = client.post(
-            "/chat",
-            json={"message": "I want a refund for invoice 143", "customer_id": 16},
-        )
-        thread_id = r1.json()["thread_id"]
-
-        r2 = client.post(
-            "/chat", json={"message": "yes", "thread_id": thread_id, "customer_id": 16}
-        )
-        assert r2.json()["requires_approval"]
+        thread_id = hitl_thread
 
         # Reject
         r3 = client.post(f"/reject/{thread_id}?customer_id=16")
@@ -120,39 +92,22 @@ class TestHITLFlow:
         assert thread_id in rejected_responses, "Should be in rejected_responses"
 
 
+@pytest.mark.integration
 class TestStatusEndpoint:
     """Test the /status endpoint for polling."""
 
-    def test_status_pending_when_awaiting_approval(self, client):
+    def test_status_pending_when_awaiting_approval(self, client, hitl_thread):
         """Status should return 'pending' when awaiting approval."""
-        # Get to HITL state
-        r1 = client.post(
-            "/chat",
-            json={"message": "I want a refund for invoice 143", "customer_id": 16},
-        )
-        thread_id = r1.json()["thread_id"]
-
-        client.post(
-            "/chat", json={"message": "yes", "thread_id": thread_id, "customer_id": 16}
-        )
+        thread_id = hitl_thread
 
         # Check status
         r3 = client.get(f"/status/{thread_id}?customer_id=16")
         assert r3.status_code == 200
         assert r3.json()["status"] == "pending"
 
-    def test_status_completed_after_approval(self, client):
+    def test_status_completed_after_approval(self, client, hitl_thread):
         """Status should return 'completed' after approval."""
-        # Get to HITL state
-        r1 = client.post(
-            "/chat",
-            json={"message": "I want a refund for invoice 143", "customer_id": 16},
-        )
-        thread_id = r1.json()["thread_id"]
-
-        client.post(
-            "/chat", json={"message": "yes", "thread_id": thread_id, "customer_id": 16}
-        )
+        thread_id = hitl_thread
 
         # Approve
         client.post(f"/approve/{thread_id}?customer_id=16")
@@ -162,20 +117,9 @@ class TestStatusEndpoint:
         assert r3.status_code == 200
         assert r3.json()["status"] == "completed"
 
-    def test_status_completed_after_rejection(self, client):
+    def test_status_completed_after_rejection(self, client, hitl_thread):
         """Status should return 'completed' with rejection message after rejection."""
-        # Get to HITL state
-        r1 = client.post(
-            "/chat",
-            json={"message": "I want a refund for invoice 143", "customer_id": 16},
-        )
-        thread_id = r1.json()["thread_id"]
-
-        r2 = client.post(
-            "/chat", json={"message": "yes", "thread_id": thread_id, "customer_id": 16}
-        )
-        # Verify HITL was triggered
-        assert r2.json().get("requires_approval"), "HITL should be triggered"
+        thread_id = hitl_thread
 
         # Reject
         r_reject = client.post(f"/reject/{thread_id}?customer_id=16")
@@ -197,18 +141,10 @@ class TestAdminEndpoint:
         assert response.status_code == 200
         assert response.json() == {"pending": []}
 
-    def test_admin_pending_shows_hitl_requests(self, client):
+    @pytest.mark.integration
+    def test_admin_pending_shows_hitl_requests(self, client, hitl_thread):
         """Admin pending should show HITL requests."""
-        # Get to HITL state
-        r1 = client.post(
-            "/chat",
-            json={"message": "I want a refund for invoice 143", "customer_id": 16},
-        )
-        thread_id = r1.json()["thread_id"]
-
-        client.post(
-            "/chat", json={"message": "yes", "thread_id": thread_id, "customer_id": 16}
-        )
+        thread_id = hitl_thread
 
         # Check admin
         r3 = client.get("/admin/pending")
@@ -217,18 +153,10 @@ class TestAdminEndpoint:
         assert pending[0]["thread_id"] == thread_id
         assert pending[0]["customer_id"] == 16
 
-    def test_admin_pending_clears_after_approval(self, client):
+    @pytest.mark.integration
+    def test_admin_pending_clears_after_approval(self, client, hitl_thread):
         """Admin pending should clear after approval."""
-        # Get to HITL state
-        r1 = client.post(
-            "/chat",
-            json={"message": "I want a refund for invoice 143", "customer_id": 16},
-        )
-        thread_id = r1.json()["thread_id"]
-
-        client.post(
-            "/chat", json={"message": "yes", "thread_id": thread_id, "customer_id": 16}
-        )
+        thread_id = hitl_thread
 
         # Approve
         client.post(f"/approve/{thread_id}?customer_id=16")
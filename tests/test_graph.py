@@ -1,52 +1,48 @@
 """Tests for the LangGraph supervisor and routing logic."""
 
+from unittest.mock import MagicMock
+
 import pytest
 from langchain_core.messages import HumanMessage
 
+from src.graph import create_graph, create_supervisor_node, keyword_route
+
 
+@pytest.mark.usefixtures("fake_llm")
 class TestGraphCreation:
-    """Tests for graph factory and structure."""
+    """Tests for graph factory and structure (no real LLM clients)."""
+
+    @pytest.fixture
+    def graph(self):
+        """Compile the graph with fake models for structural checks."""
+        return create_graph()
 
     def test_graph_can_be_created(self):
         """The graph factory function should return a compiled graph."""
-        from src.graph import create_graph
-
         graph = create_graph()
         assert graph is not None
 
-    def test_graph_has_supervisor_node(self):
+    def test_graph_has_supervisor_node(self, graph):
         """Graph should have a supervisor node for routing."""
-        from src.graph import create_graph
-
-        graph = create_graph()
         nodes = list(graph.nodes.keys())
 
         assert "supervisor" in nodes, f"Expected 'supervisor' node, got: {nodes}"
 
-    def test_graph_has_music_expert_node(self):
+    def test_graph_has_music_expert_node(self, graph):
         """Graph should have a music_expert node."""
-        from src.graph import create_graph
-
-        graph = create_graph()
         nodes = list(graph.nodes.keys())
 
         assert "music_expert" in nodes, f"Expected 'music_expert' node, got: {nodes}"
 
-    def test_graph_has_support_rep_node(self):
+    def test_graph_has_support_rep_node(self, graph):
         """Graph should have a support_rep node."""
-        from src.graph import create_graph
-
-        graph = create_graph()
         nodes = list(graph.nodes.keys())
 
         assert "support_rep" in nodes, f"Expected 'support_rep' node, got: {nodes}"
 
-    def test_graph_accepts_customer_context(self):
+    def test_graph_accepts_customer_context(self, graph):
         """Graph should accept customer_id via context parameter (context_schema)."""
-        from src.graph import create_graph
-
         # Verify graph can be created
-        graph = create_graph()
         assert graph is not None
 
         # Verify the context structure that will be used (NOT in configurable - secure!)
@@ -58,51 +54,91 @@ class TestRouting:
     """Tests for supervisor routing logic."""
 
     @pytest.mark.integration
-    def test_router_selects_music_for_music_query(self, test_config, test_context):
-        """Supervisor should route music queries to music_expert."""
-        from src.graph import create_graph
-
-        graph = create_graph()
-
-        result = graph.invoke(
-            {"messages": [HumanMessage(content="What albums does AC/DC have?")]},
+    @pytest.mark.parametrize(
+        "query",
+        [
+            pytest.param("What albums does AC/DC have?", id="music"),
+            pytest.param("What is my email address on file?", id="support"),
+        ],
+    )
+    def test_router_selects_specialist(
+        self, compiled_graph, test_config, test_context, query
+    ):
+        """Supervisor should route music and account queries to a specialist."""
+        result = compiled_graph.invoke(
+            {"messages": [HumanMessage(content=query)]},
             test_config,
             context=test_context,
         )
 
-        # Should have received a response about music
+        # Should have received a response from the specialist
         assert result is not None
         assert "messages" in result
         assert len(result["messages"]) > 1
 
-    @pytest.mark.integration
-    def test_router_selects_support_for_account_query(self, test_config, test_context):
-        """Supervisor should route account queries to support_rep."""
-        from src.graph import create_graph
-
-        graph = create_graph()
 
-        result = graph.invoke(
-            {"messages": [HumanMessage(content="What is my email address on file?")]},
-            test_config,
-            context=test_context,
+class TestKeywordRouting:
+    """Tests for the supervisor's keyword fast path."""
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            ("What AC/DC albums do you carry?", "music"),
+            ("What jazz artists do you have?", "music"),
+            ("Do you have any songs with 'love' in the title?", "music"),
+            ("Can you tell me about my account?", "support"),
+            ("I want a refund for invoice 143", "support"),
+            ("What is my email address on file?", "support"),
+        ],
+    )
+    def test_unambiguous_queries_route_by_keyword(self, text, expected):
+        """Queries with keywords for a single route skip the LLM."""
+        assert keyword_route(text) == expected
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Hello!",
+            "yes, tell me more",
+            "Do you have any Led Zeppelin?",
+            "Can I get a refund for the album I bought?",
+            # Artist names that look like support words
+            "Do you have anything by Bill Evans?",
+            "Do you have New Order?",
+            # Purchase and payment wording next to a catalog noun
+            "Which songs did I buy last month?",
+            "I want my money back for the album I purchased",
+            "I was charged twice for a song",
+            "Can I see the receipt for the track I bought?",
+            "What's my order history for albums?",
+        ],
+    )
+    def test_ambiguous_queries_fall_through(self, text):
+        """No keywords, or keywords for both routes, defer to the LLM."""
+        assert keyword_route(text) is None
+
+    def test_supervisor_skips_llm_on_keyword_match(self):
+        """The supervisor node should not touch the model for a keyword match."""
+        model = MagicMock()
+        supervisor = create_supervisor_node(model)
+
+        result = supervisor(
+            {"messages": [HumanMessage(content="What albums does AC/DC have?")]}
         )
 
-        assert result is not None
-        assert "messages" in result
+        assert result["route"] == "music"
+        assert result["messages"][0].name == "supervisor"
+        model.with_structured_output.assert_not_called()
 
 
 class TestHITL:
     """Tests for Human-in-the-Loop interrupts."""
 
-    @pytest.mark.integration
-    def test_hitl_interrupts_on_refund_request(self, test_config_with_thread):
+    def test_hitl_interrupts_on_refund_request(
+        self, fake_support_graph, test_config_with_thread
+    ):
         """Graph should interrupt before processing refund for human approval."""
-        from src.graph import create_graph
-        from langgraph.checkpoint.memory import MemorySaver
-
-        checkpointer = MemorySaver()
-        graph = create_graph(checkpointer=checkpointer)
+        graph = fake_support_graph
         config, context = test_config_with_thread("test-hitl")
 
         # First message: request a refund
@@ -115,3 +151,23 @@ class TestHITL:
         # The graph should have produced some response
         assert result is not None
         assert "messages" in result
+        assert graph.get_state(config).next == ("refund_tools",)
+
+    def test_hitl_approval_completes_refund(
+        self, fake_support_graph, test_config_with_thread
+    ):
+        """Resuming after approval should run the refund and finish the turn."""
+        from langgraph.types import Command
+
+        graph = fake_support_graph
+        config, context = test_config_with_thread("test-hitl-approve")
+        graph.invoke(
+            {"messages": [HumanMessage(content="I want a refund for invoice 134")]},
+            config,
+            context=context,
+        )
+
+        result = graph.invoke(Command(resume=True), config, context=context)
+
+        assert graph.get_state(config).next == ()
+        assert "Refund initiated for Invoice #134" in result["messages"][-2].content
@@ -0,0 +1,203 @@
+"""Tests for the get_model_for_role model factory."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.graph import (
+    DEFAULT_MODEL,
+    _MODEL_CACHE,
+    _MODEL_FACTORIES,
+    _OPTIONAL_CHAT_CLASSES,
+    _resolve_provider,
+    get_model_for_role,
+    register_model,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_model_cache():
+    """Start each test without cached clients so patched classes are used."""
+    _MODEL_CACHE.clear()
+    _OPTIONAL_CHAT_CLASSES.clear()
+    yield
+    _MODEL_CACHE.clear()
+    _OPTIONAL_CHAT_CLASSES.clear()
+
+
+@pytest.fixture(scope="session")
+def chat_openai_instance():
+    """Stand-in client; tests only check identity and constructor arguments."""
+    return object()
+
+
+@pytest.fixture
+def mock_openai(chat_openai_instance):
+    """Patch the ChatOpenAI class used by the model factory."""
+    with patch(
+        "src.graph._CHAT_OPENAI", MagicMock(return_value=chat_openai_instance)
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture
+def set_env(monkeypatch):
+    """Set (or, with None, unset) one environment variable for a test."""
+
+    def _set(key, value):
+        if value is None:
+            monkeypatch.delenv(key, raising=False)
+        else:
+            monkeypatch.setenv(key, value)
+
+    return _set
+
+
+class TestResolveProvider:
+    """Tests for provider detection from the model name."""
+
+    @pytest.mark.parametrize(
+        "model_name,expected",
+        [
+            ("gpt-4o-mini", ("openai", "gpt-4o-mini")),
+            ("gemini-2.5-flash", ("gemini", "gemini-2.5-flash")),
+            ("claude-sonnet-4-5", ("anthropic", "claude-sonnet-4-5")),
+            ("deepseek-chat", ("deepseek", "deepseek-chat")),
+            ("o3-mini", ("openai", "o3-mini")),
+        ],
+    )
+    def test_detects_provider_from_prefix(self, model_name, expected):
+        """Provider should be inferred from the model name prefix."""
+        assert _resolve_provider(model_name) == expected
+
+    def test_normalizes_case_and_whitespace(self):
+        """Model names should be matched case-insensitively."""
+        assert _resolve_provider("  Gemini-2.5-Flash ") == (
+            "gemini",
+            "gemini-2.5-flash",
+        )
+
+
+class TestGetModelForRole:
+    """Tests for building a chat model from environment configuration."""
+
+    def test_defaults_to_openai(self, set_env, mock_openai, chat_openai_instance):
+        """With no env var set, the default OpenAI model should be used."""
+        set_env("TEST_ROLE_MODEL", None)
+
+        model = get_model_for_role("Test", "TEST_ROLE_MODEL")
+
+        mock_openai.assert_called_once_with(model=DEFAULT_MODEL, temperature=0)
+        assert model is chat_openai_instance
+
+    def test_empty_env_var_uses_default(self, set_env, mock_openai):
+        """A blank env var should fall back to the default model."""
+        set_env("TEST_ROLE_MODEL", "   ")
+
+        get_model_for_role("Test", "TEST_ROLE_MODEL", default="gpt-4o")
+
+        mock_openai.assert_called_once_with(model="gpt-4o", temperature=0)
+
+    def test_env_var_is_case_insensitive(self, set_env, mock_openai):
+        """Model names from the environment should be normalized."""
+        set_env("TEST_ROLE_MODEL", "GPT-4o")
+
+        get_model_for_role("Test", "TEST_ROLE_MODEL", temperature=0.7)
+
+        mock_openai.assert_called_once_with(model="gpt-4o", temperature=0.7)
+
+    def test_gemini_model_uses_google_provider(self, set_env):
+        """gemini-* models should be built with ChatGoogleGenerativeAI."""
+        set_env("TEST_ROLE_MODEL", "gemini-2.5-flash")
+        fake_module = MagicMock()
+
+        with patch.dict("sys.modules", {"langchain_google_genai": fake_module}):
+            model = get_model_for_role("Test", "TEST_ROLE_MODEL")
+
+        fake_module.ChatGoogleGenerativeAI.assert_called_once_with(
+            model="gemini-2.5-flash", temperature=0
+        )
+        assert model is fake_module.ChatGoogleGenerativeAI.return_value
+
+    def test_deepseek_model_uses_deepseek_endpoint(self, set_env, mock_openai):
+        """deepseek-* models should use ChatOpenAI against the DeepSeek API."""
+        set_env("TEST_ROLE_MODEL", "deepseek-chat")
+        set_env("DEEPSEEK_API_KEY", "sk-deepseek")
+
+        get_model_for_role("Test", "TEST_ROLE_MODEL")
+
+        mock_openai.assert_called_once_with(
+            model="deepseek-chat",
+            temperature=0,
+            base_url="https://api.deepseek.com",
+            api_key="sk-deepseek",
+        )
+
+    @pytest.mark.parametrize(
+        "model_name,package",
+        [
+            ("claude-sonnet-4-5", "langchain_anthropic"),
+            ("gemini-2.5-flash", "langchain_google_genai"),
+        ],
+    )
+    def test_missing_provider_package_falls_back_to_openai(
+        self, set_env, mock_openai, model_name, package
+    ):
+        """If the provider's package isn't installed, use the default OpenAI model."""
+        set_env("TEST_ROLE_MODEL", model_name)
+
+        # A None entry in sys.modules makes the import raise ImportError
+        with patch.dict("sys.modules", {package: None}):
+            get_model_for_role("Test", "TEST_ROLE_MODEL")
+
+        mock_openai.assert_called_once_with(model=DEFAULT_MODEL, temperature=0)
+
+    def test_missing_provider_is_remembered(self, set_env, mock_openai):
+        """A provider found missing once should not be imported again."""
+        set_env("TEST_ROLE_MODEL", "gemini-2.5-flash")
+        _OPTIONAL_CHAT_CLASSES["gemini"] = None
+        fake_module = MagicMock()
+
+        with patch.dict("sys.modules", {"langchain_google_genai": fake_module}):
+            get_model_for_role("Test", "TEST_ROLE_MODEL")
+
+        fake_module.ChatGoogleGenerativeAI.assert_not_called()
+        mock_openai.assert_called_once_with(model=DEFAULT_MODEL, temperature=0)
+
+    def test_registered_factory_is_used(self, set_env):
+        """A model registered by name should be built by its factory."""
+        set_env("TEST_ROLE_MODEL", "My-Local-Model")
+        factory = MagicMock()
+
+        with patch.dict(_MODEL_FACTORIES):
+            register_model("my-local-model", factory)
+            model = get_model_for_role("Test", "TEST_ROLE_MODEL", temperature=0.3)
+
+        factory.assert_called_once_with(temperature=0.3)
+        assert model is factory.return_value
+
+    def test_register_model_replaces_cached_client(self, set_env, mock_openai):
+        """Registering a factory should drop clients built before it."""
+        set_env("TEST_ROLE_MODEL", "gpt-4o")
+        before = get_model_for_role("Test", "TEST_ROLE_MODEL")
+
+        with patch.dict(_MODEL_FACTORIES):
+            register_model("gpt-4o", lambda **_: object())
+            after = get_model_for_role("Test", "TEST_ROLE_MODEL")
+
+        assert after is not before
+
+    def test_same_configuration_reuses_client(self, set_env):
+        """Repeated calls with the same settings should share one client."""
+        set_env("TEST_ROLE_MODEL", None)
+
+        with patch(
+            "src.graph._CHAT_OPENAI", side_effect=lambda **_: object()
+        ) as mock_openai:
+            first = get_model_for_role("Supervisor", "TEST_ROLE_MODEL")
+            second = get_model_for_role("Support Rep", "TEST_ROLE_MODEL")
+            other = get_model_for_role("Music Expert", "TEST_ROLE_MODEL", 0.7)
+
+        assert first is second
+        assert other is not first
+        assert mock_openai.call_count == 2
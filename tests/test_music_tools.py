@@ -69,74 +69,89 @@ class TestToolDecorators:
 
         assert hasattr(list_genres, "name"), "Should be a LangChain @tool"
 
+    def test_music_tools_by_name_covers_all_tools(self):
+        """MUSIC_TOOLS_BY_NAME should map each tool's name to the tool."""
+        from src.tools.music import MUSIC_TOOLS, MUSIC_TOOLS_BY_NAME
+
+        assert len(MUSIC_TOOLS_BY_NAME) == len(MUSIC_TOOLS)
+        for tool in MUSIC_TOOLS:
+            assert MUSIC_TOOLS_BY_NAME[tool.name] is tool
+
 
 class TestToolFunctionality:
-    """Integration tests for tool database queries."""
+    """Integration tests for tool database queries.
+
+    Tools are called through .func, skipping the args-schema validation that
+    .invoke() runs; TestToolDecorators covers the tool wrappers themselves.
+    """
 
     @pytest.mark.integration
-    def test_get_albums_by_artist_returns_results(self, test_config):
+    def test_get_albums_by_artist_returns_results(self):
         """get_albums_by_artist should return album data from the database."""
         from src.tools.music import get_albums_by_artist
 
         # AC/DC is a known artist in Chinook
-        result = get_albums_by_artist.invoke({"artist": "AC/DC"}, config=test_config)
+        result = get_albums_by_artist.func("AC/DC")
 
         assert result is not None
         assert "AC/DC" in result or "acdc" in result.lower()
 
     @pytest.mark.integration
-    def test_get_tracks_by_artist_returns_results(self, test_config):
+    def test_get_tracks_by_artist_returns_results(self):
         """get_tracks_by_artist should return track data from the database."""
         from src.tools.music import get_tracks_by_artist
 
-        result = get_tracks_by_artist.invoke({"artist": "AC/DC"}, config=test_config)
+        result = get_tracks_by_artist.func("AC/DC")
 
         assert result is not None
         assert len(result) > 0
 
     @pytest.mark.integration
-    def test_check_for_songs_returns_results(self, test_config):
+    def test_check_for_songs_returns_results(self):
         """check_for_songs should find songs by title."""
         from src.tools.music import check_for_songs
 
         # "For Those About To Rock" is a known track in Chinook
-        result = check_for_songs.invoke({"song_title": "Rock"}, config=test_config)
+        result = check_for_songs.func("Rock")
 
         assert result is not None
         assert len(result) > 0
 
     @pytest.mark.integration
-    def test_get_artists_by_genre_returns_rock_artists(self, test_config):
-        """get_artists_by_genre should return artists for a given genre."""
-        from src.tools.music import get_artists_by_genre
+    @pytest.mark.parametrize(
+        "tool_name", ["get_tracks_by_artist", "get_artists_by_genre"]
+    )
+    def test_search_input_is_bound_not_interpolated(self, tool_name):
+        """Quotes in user input should not break (or inject into) LIKE queries."""
+        from src.tools import music
 
-        result = get_artists_by_genre.invoke({"genre": "Rock"}, config=test_config)
+        result = getattr(music, tool_name).func("O'Neil' OR '1'='1")
 
-        assert result is not None
-        # Should contain known rock artists from Chinook
-        assert "Led Zeppelin" in result or "U2" in result or "Deep Purple" in result
+        assert result == ""
 
     @pytest.mark.integration
-    def test_get_artists_by_genre_returns_metal_artists(self, test_config):
-        """get_artists_by_genre should return metal artists."""
+    @pytest.mark.parametrize(
+        "genre,known_artists",
+        [
+            ("Rock", ("Led Zeppelin", "U2", "Deep Purple")),
+            ("Metal", ("Metallica", "Iron Maiden", "Black Sabbath")),
+        ],
+    )
+    def test_get_artists_by_genre_returns_known_artists(self, genre, known_artists):
+        """get_artists_by_genre should return known Chinook artists for a genre."""
         from src.tools.music import get_artists_by_genre
 
-        result = get_artists_by_genre.invoke({"genre": "Metal"}, config=test_config)
+        result = get_artists_by_genre.func(genre)
 
         assert result is not None
-        # Should contain known metal artists from Chinook
-        assert (
-            "Metallica" in result
-            or "Iron Maiden" in result
-            or "Black Sabbath" in result
-        )
+        assert any(artist in result for artist in known_artists)
 
     @pytest.mark.integration
-    def test_list_genres_returns_all_genres(self, test_config):
+    def test_list_genres_returns_all_genres(self):
         """list_genres should return all available genres."""
         from src.tools.music import list_genres
 
-        result = list_genres.invoke({}, config=test_config)
+        result = list_genres.func()
 
         assert result is not None
         assert "Rock" in result
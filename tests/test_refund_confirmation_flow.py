@@ -9,49 +9,76 @@ This tests the critical flow where:
 Also tests rejection and subsequent refund requests.
 """
 
+import logging
+
 import pytest
 from langchain_core.messages import HumanMessage, AIMessage
-from langgraph.checkpoint.memory import MemorySaver
 
-from src.graph import create_graph
+from tests.helpers import find_tool_call
+
+# Every test here calls the LLM
+pytestmark = pytest.mark.integration
+
+logger = logging.getLogger(__name__)
+
+# Message texts shared across tests. Each turn wraps them in a fresh
+# HumanMessage, since add_messages assigns ids to message objects in place.
+_REFUND_143 = "I want a refund for invoice 143"
+_ACDC_QUERY = "What AC/DC albums do you have?"
+_YES = "yes"
+
+
+@pytest.fixture(scope="module")
+def refund_143_first_turns(graph_with_cached_router, test_config_with_thread):
+    """Run the shared "refund for invoice 143" opening turn for several tests.
+
+    The turns are independent threads, so they go out as one concurrent
+    graph.batch() instead of one serial invoke per test.
+
+    Returns:
+        {thread name: (config, context, result)}; each test continues only
+        its own thread.
+    """
+    names = ("test-refund-1", "test-refund-approval", "test-invoice-lookup")
+    turns = [test_config_with_thread(name) for name in names]
+    configs = [config for config, _ in turns]
+    # All threads belong to the same test customer
+    context = turns[0][1]
+
+    results = graph_with_cached_router.batch(
+        [{"messages": [HumanMessage(content=_REFUND_143)]} for _ in names],
+        configs,
+        context=context,
+    )
+    return {
+        name: (config, context, result)
+        for name, config, result in zip(names, configs, results)
+    }
 
 
 class TestRefundConfirmationFlow:
     """Test the refund confirmation flow end-to-end."""
 
     @pytest.fixture
-    def graph(self):
-        """Create a graph with checkpointer for testing."""
-        checkpointer = MemorySaver()
-        return create_graph(checkpointer=checkpointer)
+    def graph(self, graph_with_cached_router):
+        """Graph with checkpointer; routing for known queries skips the LLM."""
+        return graph_with_cached_router
 
-    def test_refund_request_triggers_hitl(self, graph, test_config_with_thread):
+    async def test_refund_request_triggers_hitl(self, graph, refund_143_first_turns):
         """A refund request should immediately call process_refund and trigger HITL."""
-        config, context = test_config_with_thread("test-refund-1")
-
-        # User asks for refund
-        result = graph.invoke(
-            {
-                "messages": [HumanMessage(content="I want a refund for invoice 143")],
-            },
-            config,
-            context=context,
-        )
+        # User asked for a refund
+        config, _, result = refund_143_first_turns["test-refund-1"]
 
         # Check that we hit the HITL interrupt
-        state = graph.get_state(config)
+        state = await graph.aget_state(config)
 
         # Verify process_refund was called (triggers HITL)
-        refund_tool_called = False
-        for msg in result["messages"]:
-            if isinstance(msg, AIMessage) and msg.tool_calls:
-                for tc in msg.tool_calls:
-                    if tc["name"] == "process_refund":
-                        refund_tool_called = True
-                        break
+        refund_tool_called = (
+            find_tool_call(result["messages"], "process_refund") is not None
+        )
 
-        print(f"\nRefund tool called: {refund_tool_called}")
-        print(f"HITL triggered (state.next): {state.next}")
+        logger.debug("Refund tool called: %s", refund_tool_called)
+        logger.debug("HITL triggered (state.next): %s", state.next)
 
         assert refund_tool_called, (
             "Support rep should call process_refund for refund requests"
@@ -60,70 +87,62 @@ class TestRefundConfirmationFlow:
             "Graph should be interrupted at refund_tools for HITL approval"
         )
 
-    def test_hitl_approval_resumes_graph(self, graph, test_config_with_thread):
+    async def test_hitl_approval_resumes_graph(self, graph, refund_143_first_turns):
         """After HITL approval (using Command), the graph should resume and complete."""
         from langgraph.types import Command
 
-        config, context = test_config_with_thread("test-refund-approval")
-
-        # User asks for refund - triggers HITL
-        graph.invoke(
-            {
-                "messages": [HumanMessage(content="I want a refund for invoice 143")],
-            },
-            config,
-            context=context,
-        )
+        # User asked for a refund - triggers HITL
+        config, context, _ = refund_143_first_turns["test-refund-approval"]
 
         # Verify we're at HITL interrupt
-        state = graph.get_state(config)
+        state = await graph.aget_state(config)
         assert state.next and "refund_tools" in state.next
 
         # Resume the graph (simulating admin approval)
         # NOTE: Must pass context= again when resuming
-        graph.invoke(Command(resume=True), config, context=context)
+        await graph.ainvoke(Command(resume=True), config, context=context)
 
         # Graph should have completed
-        final_state = graph.get_state(config)
-        print(f"\nAfter approval - state.next: {final_state.next}")
+        final_state = await graph.aget_state(config)
+        logger.debug("After approval - state.next: %s", final_state.next)
 
         # Should have completed (no more pending nodes)
         assert not final_state.next or len(final_state.next) == 0, (
             "Graph should complete after HITL approval"
         )
 
-    def test_conversation_history_preserved_across_hitl(
+    async def test_conversation_history_preserved_across_hitl(
         self, graph, test_config_with_thread
     ):
         """Conversation history should be preserved even when HITL interrupts."""
         config, context = test_config_with_thread("test-refund-history")
 
         # Turn 1: Music query (no HITL)
-        graph.invoke(
+        await graph.ainvoke(
             {
-                "messages": [HumanMessage(content="What AC/DC albums do you have?")],
+                "messages": [HumanMessage(content=_ACDC_QUERY)],
             },
             config,
             context=context,
         )
 
         # Turn 2: Refund request (triggers HITL)
-        graph.invoke(
+        await graph.ainvoke(
             {
-                "messages": [HumanMessage(content="I want a refund for invoice 143")],
+                "messages": [HumanMessage(content=_REFUND_143)],
             },
             config,
             context=context,
         )
 
         # Get state and verify history
-        state = graph.get_state(config)
+        state = await graph.aget_state(config)
         all_messages = state.values.get("messages", [])
         human_messages = [m for m in all_messages if isinstance(m, HumanMessage)]
 
-        print(f"\nHuman messages in state: {len(human_messages)}")
-        for hm in human_messages:
-            print(f"  - {hm.content}")
+        logger.debug(
+            "Human messages in state: %s", [hm.content for hm in human_messages]
+        )
 
         assert len(human_messages) >= 2, (
             "State should preserve both the music query and the refund request"
@@ -134,12 +153,11 @@ class TestSupportRepToolCalling:
     """Test that the support rep properly calls tools."""
 
     @pytest.fixture
-    def graph(self):
-        """Create a graph with checkpointer."""
-        checkpointer = MemorySaver()
-        return create_graph(checkpointer=checkpointer)
+    def graph(self, graph_with_cached_router):
+        """Graph with checkpointer; routing for known queries skips the LLM."""
+        return graph_with_cached_router
 
-    def test_support_rep_calls_refund_after_confirmation(
+    async def test_support_rep_calls_refund_after_confirmation(
         self, graph, test_config_with_thread
     ):
         """Support rep should call process_refund when user confirms."""
@@ -148,75 +166,52 @@ class TestSupportRepToolCalling:
         # Simulate a conversation where we've already discussed the invoice
         # and now the user is confirming
         initial_messages = [
-            HumanMessage(content="I want a refund for invoice 143"),
+            HumanMessage(content=_REFUND_143),
             AIMessage(
                 content="I can help with that. Invoice 143 is for $5.94 dated September 15, 2022. Would you like me to process a refund for this invoice?"
             ),
-            HumanMessage(content="yes"),
+            HumanMessage(content=_YES),
         ]
 
-        result = graph.invoke({"messages": initial_messages}, config, context=context)
+        result = await graph.ainvoke(
+            {"messages": initial_messages}, config, context=context
+        )
 
         # Check what happened
-        state = graph.get_state(config)
+        state = await graph.aget_state(config)
         messages = result["messages"]
 
         # Look for refund tool call
-        refund_called = False
-        for msg in messages:
-            if (
-                isinstance(msg, AIMessage)
-                and hasattr(msg, "tool_calls")
-                and msg.tool_calls
-            ):
-                for tc in msg.tool_calls:
-                    print(f"Tool call found: {tc['name']}")
-                    if tc["name"] == "process_refund":
-                        refund_called = True
+        refund_called = find_tool_call(messages, "process_refund") is not None
 
         hitl_triggered = state.next and len(state.next) > 0
 
-        print(f"\nRefund tool called: {refund_called}")
-        print(f"HITL triggered: {hitl_triggered}")
-        print(f"State.next: {state.next}")
+        logger.debug("Refund tool called: %s", refund_called)
+        logger.debug("HITL triggered: %s", hitl_triggered)
+        logger.debug("State.next: %s", state.next)
 
         assert refund_called or hitl_triggered, (
             "Support rep should call process_refund when user confirms"
         )
 
-    def test_get_invoice_uses_correct_ids(self, graph, test_config_with_thread):
-        """Verify get_invoice is called with customer_id (not invoice_id)."""
-        config, context = test_config_with_thread("test-invoice-lookup")
-
-        result = graph.invoke(
-            {
-                "messages": [HumanMessage(content="I want a refund for invoice 143")],
-            },
-            config,
-            context=context,
+    def test_get_invoice_uses_correct_ids(self, refund_143_first_turns):
+        """Verify get_invoice gets invoice_id from the LLM and customer_id from context."""
+        _, _, result = refund_143_first_turns["test-invoice-lookup"]
+
+        tool_call = find_tool_call(result["messages"], "get_invoice")
+        if tool_call is None:
+            # Also fine - the LLM might have used a different approach
+            logger.debug("get_invoice was not called in this run")
+            return
+
+        args = tool_call["args"]
+        logger.debug("get_invoice called with: %s", args)
+        # customer_id comes from runtime context, never from the LLM
+        assert "customer_id" not in args, (
+            f"customer_id must not be an LLM argument, got {args}"
         )
-
-        # Find the get_invoice tool call
-        for msg in result["messages"]:
-            if (
-                isinstance(msg, AIMessage)
-                and hasattr(msg, "tool_calls")
-                and msg.tool_calls
-            ):
-                for tc in msg.tool_calls:
-                    if tc["name"] == "get_invoice":
-                        args = tc["args"]
-                        print(f"get_invoice called with: {args}")
-                        # customer_id should be 16 (from context), invoice_id should be 143
-                        assert args.get("customer_id") == 16, (
-                            f"customer_id should be 16, got {args.get('customer_id')}"
-                        )
-                        # invoice_id is optional but if present should be 143
-                        if "invoice_id" in args:
-                            assert args["invoice_id"] == 143, (
-                                f"invoice_id should be 143, got {args['invoice_id']}"
-                            )
-                        return
-
-        # If we didn't find get_invoice, that's also fine - the LLM might have used different approach
-        print("Note: get_invoice was not called in this run")
+        # invoice_id is optional but if present should be 143
+        if "invoice_id" in args:
+            assert args["invoice_id"] == 143, (
+                f"invoice_id should be 143, got {args['invoice_id']}"
+            )